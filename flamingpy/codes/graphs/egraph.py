@@ -13,7 +13,7 @@
 # limitations under the License.
 """A class for representing quantum graph states."""
 
-# pylint: disable=import-outside-toplevel
+# pylint: disable=import-outside-toplevel,too-many-instance-attributes
 from typing import Union, Optional
 
 import warnings
@@ -23,7 +23,7 @@ import numpy as np
 from flamingpy.utils.linalg import are_lc_equivalent
 
 
-def macronize(can_graph, pad_boundary=False, disp=0.1):
+def macronize(can_graph, pad_boundary=False, disp=0.1, graph_cls=nx.Graph):
     """Create a macronode graph out of canonical graph can_graph.
 
     Assume can_graph represents a 'canonical' or 'reduced' graph state.
@@ -51,6 +51,8 @@ def macronize(can_graph, pad_boundary=False, disp=0.1):
             macronode to have the same number of nodes as a bulk
             macronode. For now, this only works for the RHG lattice
             connectivity (i.e. pad to 4 nodes).
+        graph_cls (type, optional): the class of the macronized graph, which
+            must be nx.Graph (default) or a subclass thereof.
 
     Returns:
         nx.Graph: the macronized graph, with a macronode-to-micronode
@@ -58,32 +60,23 @@ def macronize(can_graph, pad_boundary=False, disp=0.1):
     """
     if disp >= 0.5 or disp < 0:
         raise ValueError("Please set disp to a positive value strictly less than 0.5.")
-    macro_graph = nx.Graph(**can_graph.graph)
+    macro_graph = graph_cls(**can_graph.graph)
     # The macronode-to-micronode dictionary
     macro_dict = {}
-    for edge in can_graph.edges:
-        old_point_1, old_point_2 = np.array(edge[0]), np.array(edge[1])
-        direction_vec = old_point_2 - old_point_1
-        distance = np.linalg.norm(direction_vec)
-        periodic_flip = -1 if can_graph.edges[edge].get("periodic") else 1
-        shortened_vec = periodic_flip * disp * direction_vec / distance
-        shortened_vec = np.round(shortened_vec, -int(np.log10(disp)) + 2)
-        new_point_1 = tuple(old_point_1 + shortened_vec)
-        new_point_2 = tuple(old_point_2 - shortened_vec)
-        macro_graph.add_node(new_point_1, **can_graph.nodes[edge[0]])
-        macro_graph.add_node(new_point_2, **can_graph.nodes[edge[1]])
-        macro_graph.add_edge(new_point_1, new_point_2, **can_graph.edges[edge])
+    edges = list(can_graph.edges(data=True))
+    new_points_1, new_points_2 = _dumbbell_points(edges, disp)
+    nodes_view = can_graph.nodes
+    for (u, v, edge_attrs), new_point_1, new_point_2 in zip(edges, new_points_1, new_points_2):
+        macro_graph.add_node(new_point_1, **nodes_view[u])
+        macro_graph.add_node(new_point_2, **nodes_view[v])
+        macro_graph.add_edge(new_point_1, new_point_2, **edge_attrs)
 
         # Add to the macronode-to-micronode dictionary
-        if not macro_dict.get(edge[0]):
-            macro_dict[edge[0]] = []
-        if not macro_dict.get(edge[1]):
-            macro_dict[edge[1]] = []
-        macro_dict[edge[0]].append(new_point_1)
-        macro_dict[edge[1]].append(new_point_2)
+        macro_dict.setdefault(u, []).append(new_point_1)
+        macro_dict.setdefault(v, []).append(new_point_2)
 
     if pad_boundary:
-        for node in can_graph:
+        for node, node_attrs in can_graph.nodes(data=True):
             macro_size = len(macro_dict[node])
             if macro_size < 4:
                 n_new = 4 - macro_size
@@ -91,7 +84,7 @@ def macronize(can_graph, pad_boundary=False, disp=0.1):
                     new_node = list(node)
                     new_node[i] = new_node[i] + 0.05
                     new_node_tup = tuple(new_node)
-                    macro_graph.add_node(new_node_tup, **can_graph.nodes[node])
+                    macro_graph.add_node(new_node_tup, **node_attrs)
                     macro_dict[node].append(new_node_tup)
 
     macro_graph.graph["macro_dict"] = macro_dict
@@ -102,6 +95,32 @@ def macronize(can_graph, pad_boundary=False, disp=0.1):
     return macro_graph
 
 
+def _dumbbell_points(edges, disp):
+    """Return the micronode coordinates of the dumbbells replacing edges.
+
+    The coordinates for all edges are computed at once. See macronize for
+    the meaning of the arguments.
+
+    Returns:
+        (list, list): the new coordinates of the first and second endpoints
+            of each edge.
+    """
+    if not edges:
+        return [], []
+    old_points_1 = np.array([edge[0] for edge in edges], dtype=float).reshape(len(edges), -1)
+    old_points_2 = np.array([edge[1] for edge in edges], dtype=float).reshape(len(edges), -1)
+    direction_vecs = old_points_2 - old_points_1
+    distances = np.linalg.norm(direction_vecs, axis=1)
+    periodic_flips = np.where([edge[2].get("periodic") for edge in edges], -1, 1)
+    shortened_vecs = (
+        periodic_flips[:, np.newaxis] * disp * direction_vecs / distances[:, np.newaxis]
+    )
+    shortened_vecs = np.round(shortened_vecs, -int(np.log10(disp)) + 2)
+    new_points_1 = list(map(tuple, old_points_1 + shortened_vecs))
+    new_points_2 = list(map(tuple, old_points_2 - shortened_vecs))
+    return new_points_1, new_points_2
+
+
 class EGraph(nx.Graph):
     """An enhanced graph for representing quantum graph states.
 
@@ -117,7 +136,8 @@ class EGraph(nx.Graph):
         to_points (dict): if self.index_generator() has been run,
             a dictionary of the form {indices: points}
         adj_mat (np.array): if self.adj_generator() has been run,
-            the adjacency matrix of the graph.
+            the adjacency matrix of the graph, in the form (dense or sparse)
+            most recently requested.
     """
 
     def __init__(self, *args, indexer="default", macronodes=False, **kwargs):
@@ -129,6 +149,29 @@ class EGraph(nx.Graph):
         self.to_indices = None
         self.to_points = None
         self.adj_mat = None
+        # Cached node ordering and dense and sparse adjacency matrices
+        self._sorted_nodes = None
+        self._adj_dense = None
+        self._adj_sparse = None
+        # Cached node list and the corresponding N x d array of coordinates, or
+        # None if the nodes are not coordinates of a common dimension
+        self._node_list = None
+        self._coord_cache = None
+
+    @property
+    def adj_mat(self):
+        """The adjacency matrix of self, if self.adj_generator() has been
+        run."""
+        return self._adj_mat
+
+    @adj_mat.setter
+    def adj_mat(self, adj):
+        # Setting adj_mat to None also discards the cached adjacency matrices,
+        # so that they are rebuilt by the next call to self.adj_generator()
+        if adj is None:
+            self._adj_dense = None
+            self._adj_sparse = None
+        self._adj_mat = adj
 
     def index_generator(self):
         """Generate indices for the nodes of self.
@@ -152,34 +195,50 @@ class EGraph(nx.Graph):
             ind_dict = {points[i]: i for i in range(N)}
         self.to_indices = ind_dict
         self.to_points = {index: point for point, index in ind_dict.items()}
+        self._sorted_nodes = list(ind_dict)
         return ind_dict
 
-    def adj_generator(self, sparse=True):
-        """Return the correctly indexed adjacency matrix of the graph and set
-        the self.adj_mat attribute.
+    def adj_generator(self, sparse=True, set_attr=True):
+        """Return the correctly indexed adjacency matrix of the graph and, if
+        set_attr is True, set the self.adj_mat attribute.
 
         Calling the NetworkX adjacency matrix methods with default
         options may create a mismatch between the indices of the
         rows/columns of the matrix and the indices generated by
         self.index_generator(). This function demands that the indices
         match.
+
+        The dense and sparse matrices are cached separately, so each is
+        only built once until the graph is modified.
+
+        Args:
+            sparse (bool): whether to return a sparse (default) or dense matrix.
+            set_attr (bool): whether to set self.adj_mat to the returned
+                matrix (default). If False, self.adj_mat is left unchanged.
         """
-        if self.adj_mat is not None:
-            return self.adj_mat
-        if self.to_points is None:
-            self.index_generator()
-        sorted_nodes = [self.to_points[i] for i in range(self.order())]
-        # TODO: Reconsider data type for more intricate weights.
-        if sparse:
-            adj = nx.to_scipy_sparse_array(self, nodelist=sorted_nodes, dtype=np.int8)
-        else:
-            adj = nx.to_numpy_array(self, nodelist=sorted_nodes, dtype=np.int8)
-        self.adj_mat = adj
+        adj = self._adj_sparse if sparse else self._adj_dense
+        if adj is None:
+            if self.to_points is None:
+                self.index_generator()
+            if self._sorted_nodes is None:
+                self._sorted_nodes = [self.to_points[i] for i in range(self.order())]
+            # TODO: Reconsider data type for more intricate weights.
+            if sparse:
+                adj = nx.to_scipy_sparse_array(self, nodelist=self._sorted_nodes, dtype=np.int8)
+                self._adj_sparse = adj
+            else:
+                adj = nx.to_numpy_array(self, nodelist=self._sorted_nodes, dtype=np.int8)
+                self._adj_dense = adj
+        if set_attr:
+            self.adj_mat = adj
         return adj
 
     def slice_coords(self, plane, number):
         """Obtain all the coordinates in an x, y, or z slice of self.
 
+        The coordinates of the nodes are cached in an array, which is
+        rebuilt whenever the nodes of self, or their order, change.
+
         Args:
             plane (str): 'x', 'y', or 'z', denoting the slice direction
             number (int): the index of the slice. The allowable range is from 0
@@ -190,7 +249,19 @@ class EGraph(nx.Graph):
         """
         plane_dict = {"x": 0, "y": 1, "z": 2}
         plane_ind = plane_dict[plane]
-        coords = [point for point in self.nodes if point[plane_ind] == number]
+        nodes = list(self)
+        if nodes != self._node_list:
+            self._node_list = nodes
+            try:
+                self._coord_cache = np.array(nodes, dtype=np.float64)
+            except (TypeError, ValueError):
+                # the nodes are not coordinates of a common dimension
+                self._coord_cache = None
+        if self._coord_cache is None or self._coord_cache.ndim != 2:
+            coords = [point for point in nodes if point[plane_ind] == number]
+        else:
+            mask = self._coord_cache[:, plane_ind] == number
+            coords = [nodes[i] for i in np.flatnonzero(mask)]
         return coords
 
     def macronize(self, pad_boundary=False, disp=0.1):
@@ -198,7 +269,11 @@ class EGraph(nx.Graph):
 
         See egraph.macronize for more details.
         """
-        return EGraph(macronize(self, pad_boundary, disp), macronodes=True)
+        # Build the EGraph directly rather than copying an nx.Graph
+        macro_graph = macronize(self, pad_boundary, disp, graph_cls=EGraph)
+        macro_graph._macronodes = True  # pylint: disable=protected-access
+        macro_graph.macro_to_micro = macro_graph.graph.get("macro_dict")
+        return macro_graph
 
     def draw(self, backend="matplotlib", **kwargs):
         """Draw the graph state with Matplotlib.
@@ -290,7 +365,7 @@ class EGraph(nx.Graph):
 
                 self.add_edges_from(neighborhood)
 
-        self.adj_mat = None
+        self._invalidate_caches()
 
     def _update_attributes_add_qubit(self, qubit, add_to_macro):
         """Update self.macro_to_micro, self.to_points, and self.to_indices."""
@@ -351,7 +426,15 @@ class EGraph(nx.Graph):
                     del macro_dict[k]
 
         self.macro_to_micro = macro_dict if self.macro_to_micro is not None else None
+        self._invalidate_caches()
+
+    def _invalidate_caches(self):
+        """Reset the cached node ordering, coordinates, and adjacency matrices
+        of self."""
+        self._sorted_nodes = None
         self.adj_mat = None
+        self._node_list = None
+        self._coord_cache = None
 
     def is_lc_equivalent(self, graph2, clifford_form="tensor"):
         """Check if two EGraphs are LC equivalent, and return the Clifford
@@ -1,44 +1,192 @@
 """Helper functions for linear algebra used for testing LC equivalence."""
 
+# pylint: disable=import-outside-toplevel
+from functools import wraps
+from importlib.util import find_spec
+import warnings
+
 import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
 
+# Numba is optional, and only imported once a compiled kernel is first used
+numba_available = find_spec("numba") is not None
 
-def reduce_RREform_mod2(M, max_cols=None):
-    """Put a binary matrix into row reduced echelon form modulo 2, up to a
-    maximum number of columns given by max_cols.
+
+def _jit(func):
+    """Compile func with Numba on its first call.
+
+    If Numba is installed but cannot be imported, or fails to compile
+    func, a warning is raised, numba_available is set to False, and the
+    wrapper returns None so that the caller can fall back to NumPy. The
+    uncompiled function remains available as the py_func attribute.
+    """
+    compiled = None
+    # Numba's compilation errors, once it has been imported
+    numba_error = ()
+
+    @wraps(func)
+    def wrapper(*args):
+        global numba_available  # pylint: disable=global-statement
+        nonlocal compiled, numba_error
+        try:
+            if compiled is None:
+                from numba import njit
+                from numba.core.errors import NumbaError
+
+                compiled, numba_error = njit(cache=True)(func), NumbaError
+            return compiled(*args)
+        except ImportError as error:
+            message = str(error)
+        except Exception as error:  # pylint: disable=broad-except
+            if not isinstance(error, numba_error):
+                raise
+            message = str(error)
+        numba_available = False
+        warnings.warn(f"Numba could not be used, falling back to NumPy: {message}", ImportWarning)
+        return None
+
+    wrapper.py_func = func
+    return wrapper
+
+
+def pack_bits(M):
+    """Pack the rows of a binary matrix into 64-bit words.
+
+    Column j of M is stored in bit j % 64 of word j // 64 of the
+    corresponding row, so that the addition of two rows modulo 2 becomes
+    a bitwise XOR over ceil(n / 64) words.
 
     Args:
-        M (numpy.array): the matrix to reduce.
-        max_cols (int): the maximum number of columns of the input array to reduce.
+        M (numpy.array): an m x n binary matrix.
     Returns:
-        (numpy.array, int): the reduced matrix and the the index of pivot column.
+        (numpy.array, int): the packed uint64 array of shape
+            (m, ceil(n / 64)) and the number of columns n of M.
     """
-    # number of columns to apply row reduction
-    max_cols = M.shape[1] if max_cols is None else max_cols
-    # row reduced matrix
-    R = M.copy()
+    m_rows, n_cols = np.shape(M)
+    n_words = -(-n_cols // 64)
+    packed = np.zeros((m_rows, 8 * n_words), dtype=np.uint8)
+    packed[:, : -(-n_cols // 8)] = np.packbits(
+        np.asarray(M).astype(bool), axis=1, bitorder="little"
+    )
+    return packed.view("<u8").astype(np.uint64), n_cols
+
+
+def unpack_bits(words, n_cols):
+    """Unpack 64-bit words into the rows of a binary matrix.
+
+    This is the inverse of pack_bits.
+
+    Args:
+        words (numpy.array): a uint64 array of shape (m, ceil(n / 64)).
+        n_cols (int): the number of columns n of the unpacked matrix.
+    Returns:
+        numpy.array: an m x n binary matrix of type uint8.
+    """
+    packed = np.ascontiguousarray(words, dtype="<u8").view(np.uint8)
+    return np.unpackbits(packed, axis=1, count=n_cols, bitorder="little")
+
+
+def reduce_packed_RREform_mod2(words, max_cols):
+    """Put a bit-packed binary matrix into row reduced echelon form modulo 2,
+    up to a maximum number of columns given by max_cols.
+
+    The reduction is performed in place on the rows of words, as
+    produced by pack_bits.
+
+    Args:
+        words (numpy.array): the uint64 array of packed rows to reduce.
+        max_cols (int): the maximum number of (unpacked) columns to reduce.
+    Returns:
+        int: the index of pivot column.
+    """
+    if max_cols > 64 * words.shape[1]:
+        raise ValueError(
+            f"Cannot reduce {max_cols} columns of a packed matrix with "
+            f"{64 * words.shape[1]} columns."
+        )
+    reduced = _reduce_packed_RREform_mod2_jit(words, max_cols) if numba_available else None
+    if reduced is not None:
+        return reduced
     # pivot index
     p = 0
     # perform row reduction
     for j in range(max_cols):
+        # word and bit holding column `j`
+        word, bit = j >> 6, np.uint64(1 << (j & 63))
+        # read column `j` once
+        col = (words[:, word] & bit).astype(bool)
         # look for pivot column `j` at or below row `p`
-        index = np.nonzero(R[p:, j])[0]
+        index = np.flatnonzero(col[p:])
         if index.size == 0:
             continue
         # pivot row
         i = p + index[0]
+        # interchange `p` and `i`, along with their entries in column `j`
+        if i != p:
+            words[[p, i]] = words[[i, p]]
+            col[i] = col[p]
+        # add zeros above and below the pivot; the pivot row vanishes
+        # before column `j`, so only the words from `word` onwards change
+        col[p] = False
+        words[col, word:] ^= words[p, word:]
+        # increment pivot index until final row is reached
+        p += 1
+        if p == words.shape[0]:
+            break
+    return p
+
+
+@_jit
+def _reduce_packed_RREform_mod2_jit(words, max_cols):
+    """Compiled kernel for reduce_packed_RREform_mod2."""
+    m_rows, n_words = words.shape
+    p = 0
+    for j in range(max_cols):
+        word = j >> 6
+        bit = np.uint64(1) << np.uint64(j & 63)
+        # look for pivot column `j` at or below row `p`
+        i = p
+        while i < m_rows and (words[i, word] & bit) == 0:
+            i += 1
+        if i == m_rows:
+            continue
         # interchange `p` and `i`
-        R[[p, i], :] = R[[i, p], :]
-        # set pivot to 1
-        R[p, :] = R[p, :] / R[p, j]
-        # add zeros above and below the pivot
-        index = np.nonzero(R[:, j])[0].tolist()
-        index.remove(p)
-        R[index, :] = (R[index, :] - np.multiply.outer(R[index, j], R[p, :])) % 2
+        if i != p:
+            for w in range(n_words):
+                words[p, w], words[i, w] = words[i, w], words[p, w]
+        # add zeros above and below the pivot; the pivot row vanishes
+        # before column `j`, so only the words from `word` onwards change
+        for r in range(m_rows):
+            if r != p and (words[r, word] & bit) != 0:
+                for w in range(word, n_words):
+                    words[r, w] ^= words[p, w]
         # increment pivot index until final row is reached
         p += 1
-        if p == R.shape[0]:
+        if p == m_rows:
             break
+    return p
+
+
+def reduce_RREform_mod2(M, max_cols=None):
+    """Put a binary matrix into row reduced echelon form modulo 2, up to a
+    maximum number of columns given by max_cols.
+
+    Args:
+        M (numpy.array): the matrix to reduce.
+        max_cols (int): the maximum number of columns of the input array to reduce.
+    Returns:
+        (numpy.array, int): the reduced matrix and the the index of pivot column.
+    """
+    # number of columns to apply row reduction
+    max_cols = M.shape[1] if max_cols is None else max_cols
+    if max_cols > M.shape[1]:
+        raise ValueError(f"Cannot reduce {max_cols} columns of a matrix with {M.shape[1]} columns.")
+    # pack the rows so that row additions act on 64 columns at once
+    words, n_cols = pack_bits(M)
+    p = reduce_packed_RREform_mod2(words, max_cols)
+    # row reduced matrix
+    R = unpack_bits(words, n_cols).astype(M.dtype, copy=False)
     return R, p
 
 
@@ -49,31 +197,29 @@ def lc_constraint_system(G, H):
     G and H must satisfy for equivalence through local complementations.
 
     Args:
-        G, H (numpy.array): n x n adjacency matrices.
+        G, H (numpy.array or scipy.sparse array): n x n adjacency matrices.
     Returns:
-        numpy.array: an array of shape n^2 x 4n representing a system of n^2
-            binary linear equations with 4n unknowns.
+        numpy.array: a uint8 array of shape n^2 x 4n representing a system of
+            n^2 binary linear equations with 4n unknowns.
     """
+    # binary dense adjacency matrices; these are small compared to the system
+    G, H = ((adj.toarray() if sp.issparse(adj) else np.asarray(adj)) % 2 for adj in (G, H))
     # set the number of qubits
     n = np.shape(G)[0]
-    # define empty block matrix
-    M = []
-    for j in range(n):
-        # A block
-        A = np.diag(G[j])
-        # B block
-        B = np.zeros((n, n))
-        B[j, j] = 1
-        # C block
-        C = np.array([[G[i, j] * H[i, k] for i in range(n)] for k in range(n)], dtype=int)
-        # D block
-        D = np.zeros((n, n), dtype=int)
-        for k in range(n):
-            D[k, j] = H[j, k]
-        # add row block to M
-        M.append([A, B, C, D])
-    # define numpy block matrix for system of constraints
-    return np.block(M).astype(int)
+    idx = np.arange(n)
+    # the row block j of the system is [A_j, B_j, C_j, D_j]; store entry
+    # (r, c) of block X_j at index [j, r, X, c]
+    M = np.zeros((n, n, 4, n), dtype=np.uint8)
+    # A blocks: A_j = diag(G[j])
+    M[:, idx, 0, idx] = G
+    # B blocks: B_j has a single 1 at (j, j)
+    M[idx, idx, 1, idx] = 1
+    # C blocks: C_j[k, i] = G[i, j] * H[i, k]
+    M[:, :, 2, :] = np.einsum("ij,ik->jki", G, H)
+    # D blocks: D_j[k, j] = H[j, k]
+    M[idx, :, 3, idx] = H
+    # flatten into the n^2 x 4n system of constraints
+    return M.reshape(n * n, 4 * n)
 
 
 def nullspace_basis(M):
@@ -85,19 +231,24 @@ def nullspace_basis(M):
     Args:
         M (numpy.array): a binary matrix.
     Returns:
-        numpy.array: an array whose rows are basis vectors of the right
+        numpy.array: a uint8 array whose rows are basis vectors of the right
             nullspace of M.
     """
     # find left Null space of transposed system, which is equal to right null space
     M_transposed = M.T
     m_rows, n_cols = M_transposed.shape
-    # construct augmented block matrix A = [M | I]
-    A = np.concatenate((M_transposed, np.eye(m_rows, dtype=int)), axis=-1)
+    # construct packed augmented block matrix A = [M | I], with the identity
+    # block starting at a word boundary
+    words_M, _ = pack_bits(M_transposed)
+    words_I, _ = pack_bits(np.eye(m_rows, dtype=np.uint8))
+    words = np.concatenate((words_M, words_I), axis=-1)
     # row reduce left M block of augmented matrix
-    R, p = reduce_RREform_mod2(A, max_cols=n_cols)
-    N = R[p:, n_cols:]
-    basis, _ = reduce_RREform_mod2(N)
-    return basis
+    p = reduce_packed_RREform_mod2(words, max_cols=n_cols)
+    # the right block below the pivots spans the nullspace; row reduce it
+    # in place to obtain the canonical basis
+    N = np.ascontiguousarray(words[p:, words_M.shape[1] :])
+    reduce_packed_RREform_mod2(N, max_cols=m_rows)
+    return unpack_bits(N, m_rows)
 
 
 def search_nullspace(basis):
@@ -121,42 +272,52 @@ def search_nullspace(basis):
     d = basis.shape[0]
     # number of nodes/qubits
     n = int(basis.shape[1] / 4)
-    # boolean for LC equivalence
-    equivalent = False
-    # array to store potential solutions
-    sols = []
-    # search through distinct pairs of basis vectors
+    # binary basis vectors, so that addition modulo 2 is a bitwise XOR
+    basis = np.ascontiguousarray(basis, dtype=np.uint8)
+    found = _search_nullspace_jit(basis, n) if numba_available else None
+    if found is not None:
+        i, j = found
+        if i < 0:
+            return None
+        return np.bitwise_xor(basis[i], basis[j]).astype(int)
+    # sums (modulo 2) of all distinct pairs of basis vectors, in the order
+    # (1, 0), (2, 0), (2, 1), (3, 0), ...
+    rows, cols = np.tril_indices(d, k=-1)
+    sols = basis[rows] ^ basis[cols]
+    # check the determinants (modulo 2) for all pairs and nodes at once
+    dets = (sols[:, :n] & sols[:, 3 * n :]) ^ (sols[:, n : 2 * n] & sols[:, 2 * n : 3 * n])
+    valid = np.flatnonzero(dets.all(axis=1))
+    # if no solution found, return None
+    if valid.size == 0:
+        return None
+    # if solution found, return clifford in vector form
+    return sols[valid[0]].astype(int)
+
+
+@_jit
+def _search_nullspace_jit(basis, n):
+    """Compiled kernel for search_nullspace.
+
+    Return the indices (i, j) of the first pair of basis vectors whose
+    sum satisfies the determinant constraints, or (-1, -1) if there is
+    none.
+    """
+    d = basis.shape[0]
     for i in range(d):
         for j in range(i):
-            # boolean for checking solution constraints
             sat = True
-            # potential solution as sum (modulo 2) of basis pair
-            sol = np.vectorize(lambda x: x % 2)(np.add(basis[i], basis[j]))
-            # store potential solution
-            sols.append(sol)
             for k in range(n):
-                # check the determinants (modulo 2)
-                det = (sol[k] * sol[k + 3 * n] + sol[k + n] * sol[k + 2 * n]) % 2
-                if det != 1:
-                    # constraints not satisfied
+                # check the determinant (modulo 2) of the sum for node k
+                a = basis[i, k] ^ basis[j, k]
+                b = basis[i, k + n] ^ basis[j, k + n]
+                c = basis[i, k + 2 * n] ^ basis[j, k + 2 * n]
+                d_k = basis[i, k + 3 * n] ^ basis[j, k + 3 * n]
+                if ((a & d_k) ^ (b & c)) == 0:
                     sat = False
-                    # remove the false solution
-                    sols.pop()
                     break
-            # if solution found, set equivalent to True
             if sat:
-                # equivalence is satisfied
-                equivalent = sat
-                break
-        # end search loop
-        if equivalent:
-            break
-    # if no solution found, return None
-    if not equivalent:
-        return None
-    # if solution found, return clifford in vector form
-    solution_vector = np.array(sols[0]).astype(int)
-    return solution_vector
+                return i, j
+    return -1, -1
 
 
 def clifford_vec_to_tensors(vec):
@@ -181,12 +342,9 @@ def clifford_vec_to_tensors(vec):
     """
     # number of nodes/qubits
     n = int(len(vec) / 4)
-    # initialize empty list
-    local_clifford_list = []
-    for i in range(n):
-        single_qubit_clifford = np.array([[vec[i], vec[i + n]], [vec[i + 2 * n], vec[i + 3 * n]]])
-        local_clifford_list.append(single_qubit_clifford)
-    return local_clifford_list
+    # rows (a, b, c, d) arranged as [[a_k, b_k], [c_k, d_k]] for each qubit k
+    tensors = np.asarray(vec).reshape(2, 2, n).transpose(2, 0, 1)
+    return list(tensors)
 
 
 def clifford_vec_to_global(vec):
@@ -218,8 +376,36 @@ def clifford_vec_to_global(vec):
     """
     # number of nodes/qubits
     n = int(len(vec) / 4)
-    blocks = [np.diag([vec[i + k * n] for i in range(n)]) for k in range(4)]
-    return np.block([[blocks[0], blocks[1]], [blocks[2], blocks[3]]])
+    a, b, c, d = np.asarray(vec).reshape(4, n)
+    clifford = np.zeros((2 * n, 2 * n), dtype=a.dtype)
+    # fill in the diagonals of the A, B, C and D blocks
+    idx = np.arange(n)
+    clifford[idx, idx] = a
+    clifford[idx, idx + n] = b
+    clifford[idx + n, idx] = c
+    clifford[idx + n, idx + n] = d
+    return clifford
+
+
+def have_same_components(G, H):
+    """Check if two graphs partition their nodes into the same connected
+    components.
+
+    Local complementations preserve the connected components of a graph, so
+    this is a necessary condition for the LC equivalence of G and H.
+
+    Args:
+        G, H (numpy.array or scipy.sparse array): n x n adjacency matrices.
+    Returns:
+        bool: whether the connected components of G and H coincide.
+    """
+    n_comps_G, labels_G = connected_components(G, directed=False)
+    n_comps_H, labels_H = connected_components(H, directed=False)
+    if n_comps_G != n_comps_H:
+        return False
+    # the partitions coincide if and only if each component of G is paired
+    # with exactly one component of H
+    return len(set(zip(labels_G, labels_H))) == n_comps_G
 
 
 def are_lc_equivalent(graph1, graph2, clifford_form="tensor"):
@@ -241,25 +427,27 @@ def are_lc_equivalent(graph1, graph2, clifford_form="tensor"):
         (bool, numpy.array): whether the states are LC equivalent, and if they are, the local
             Clifford output according to 'clifford_form' specification.
     """
-    # get adjacency matrices of input graphs
-    graph1.adj_generator(sparse=False)
-    G = graph1.adj_mat
-    graph2.adj_generator(sparse=False)
-    H = graph2.adj_mat
-
     # handle input and edge cases
     #
-    # adjacency matrices of input graphs must have type 'np.ndarray'
-    if not isinstance(G, np.ndarray) or not isinstance(H, np.ndarray):
-        raise ValueError(
-            "Input EGraphs must have their 'adj_mat' property as type 'numpy.ndarray'."
+    # input graphs must be EGraphs
+    if not hasattr(graph1, "adj_generator") or not hasattr(graph2, "adj_generator"):
+        raise TypeError(
+            f"Input graphs must be of type EGraph, but were given {type(graph1)} and "
+            f"{type(graph2)}."
         )
     # demand input graphs must have nonzero number of nodes.
-    # check adjacency matrices for same non-empty square shape
-    if np.shape(G) == (0, 0) or np.shape(H) == (0, 0):
+    if graph1.order() == 0 or graph2.order() == 0:
         # raise ValueError('Input Graphs must be non-empty')
         # Mark this case as not equivalent
         return False, None
+
+    # get adjacency matrices of input graphs, reusing the cached sparse
+    # matrices that are also used for noise application, without changing
+    # the adj_mat attribute of the graphs
+    G = graph1.adj_generator(sparse=True, set_attr=False)
+    H = graph2.adj_generator(sparse=True, set_attr=False)
+
+    # check adjacency matrices for same square shape
     if np.shape(G) != np.shape(H):
         # raise ValueError('Input Graphs must have same number of nodes.')
         # Mark this case as not equivalent
@@ -267,6 +455,9 @@ def are_lc_equivalent(graph1, graph2, clifford_form="tensor"):
     # adjacency matrices must be square
     if np.shape(G)[0] != np.shape(G)[1]:
         raise ValueError("Input matrices must be square.")
+    # graphs with different connected components are not LC equivalent
+    if not have_same_components(G, H):
+        return False, None
 
     # perform algorithm to search for solution
     #
@@ -94,6 +94,35 @@ class TestEGraph:
         E_adj = E.adj_mat
         assert np.array_equal(H_adj, E_adj)
 
+    def test_adj_generator(self, random_graph):
+        """Test that the dense and sparse adjacency matrices are cached
+        separately and agree with each other."""
+        E = EGraph(random_graph[0])
+        E_adj_sparse = E.adj_generator(sparse=True)
+        E_adj = E.adj_generator(sparse=False)
+        assert isinstance(E_adj, np.ndarray)
+        assert E.adj_mat is E_adj
+        assert np.array_equal(E_adj, E_adj_sparse.toarray())
+        assert np.array_equal(E_adj, random_graph[1])
+        assert E.adj_generator(sparse=True) is E_adj_sparse
+        assert E.adj_mat is E_adj_sparse
+        assert E.adj_generator(sparse=False, set_attr=False) is E_adj
+        assert E.adj_mat is E_adj_sparse
+
+    def test_adj_mat_reset(self):
+        """Test that setting adj_mat to None rebuilds the cached adjacency
+        matrices after the graph is modified in place."""
+        E = EGraph([((0, 0, 0), (1, 0, 0))])
+        E.add_node((2, 0, 0))
+        H = EGraph([((0, 0, 0), (1, 0, 0)), ((1, 0, 0), (2, 0, 0))])
+        assert E.adj_generator(sparse=False)[1, 2] == 0
+        assert not E.is_lc_equivalent(H)[0]
+        E.add_edge((1, 0, 0), (2, 0, 0))
+        E.adj_mat = None
+        assert E.adj_generator(sparse=False)[1, 2] == 1
+        assert E.adj_generator(sparse=True)[1, 2] == 1
+        assert E.is_lc_equivalent(H)[0]
+
     def test_add_qubit(self, random_graph_3D):
         """Test the add_qubit function on a random EGraph."""
 
@@ -173,6 +202,23 @@ class TestEGraph:
             E.remove_qubit("s")
         assert e.type == TypeError
 
+    def test_macronize_2D(self):
+        """Test macronize on a graph with 2D coordinates and on a graph without
+        edges."""
+        E = EGraph()
+        E.add_edges_from([((0, 0), (1, 0)), ((1, 0), (1, 1))])
+        MEG = E.macronize(disp=0.1)
+        assert set(MEG.macro_to_micro[(1, 0)]) == {(0.9, 0.0), (1.0, 0.1)}
+        assert MEG.number_of_nodes() == 4
+        assert MEG.number_of_edges() == 2
+        MEG.index_generator()
+        assert list(MEG.to_indices) == [(0.1, 0.0), (0.9, 0.0), (1.0, 0.1), (1.0, 0.9)]
+
+        MEG = EGraph().macronize()
+        assert MEG.number_of_nodes() == 0
+        assert MEG.macro_to_micro == {}
+        assert MEG.index_generator() == {}
+
     def test_add_qubit_macro(self, random_graph_3D):
         """Test add_qubit if graph is macronized."""
         EG = EGraph(random_graph_3D)
@@ -210,5 +256,39 @@ class TestEGraph:
         # def test_macronode(self):
         # pass
 
-        # def test_slice_coords(self):
-        # pass
+    def test_slice_coords(self, random_graph_3D):
+        """Test slice_coords against a direct scan of the nodes, including
+        after the graph is modified."""
+        E = EGraph(random_graph_3D)
+        for plane, ind in zip("xyz", range(3)):
+            for number in {node[ind] for node in E}:
+                expected = [node for node in E if node[ind] == number]
+                assert E.slice_coords(plane, number) == expected
+        assert E.slice_coords("x", -1) == []
+
+        new_q = (-1, 0, 0)
+        E.add_qubit(new_q)
+        assert E.slice_coords("x", -1) == [new_q]
+        E.remove_qubit(new_q)
+        assert E.slice_coords("x", -1) == []
+        E.add_node(new_q)
+        assert E.slice_coords("x", -1) == [new_q]
+
+        # replace a node one-for-one without going through EGraph methods
+        E.remove_node(new_q)
+        E.add_node((-2, 0, 0))
+        assert E.slice_coords("x", -1) == []
+        assert E.slice_coords("x", -2) == [(-2, 0, 0)]
+        nx.relabel_nodes(E, {(-2, 0, 0): (-3, 0, 0)}, copy=False)
+        assert E.slice_coords("x", -2) == []
+        assert E.slice_coords("x", -3) == [(-3, 0, 0)]
+
+        # 2D coordinates, and the empty graph
+        E = EGraph()
+        E.add_edge((0, 5), (1, 5))
+        E.add_node((7, 7))
+        assert E.slice_coords("x", 1) == [(1, 5)]
+        assert E.slice_coords("y", 5) == [(0, 5), (1, 5)]
+        with pytest.raises(IndexError):
+            E.slice_coords("z", 0)
+        assert EGraph().slice_coords("x", 0) == []
@@ -13,12 +13,19 @@
 # limitations under the License.
 """Unit tests for is_lc_equivalent() method of EGraph class."""
 
-# pylint: disable=no-self-use
+# pylint: disable=no-self-use,protected-access
+
+import sys
 
 import pytest
+import networkx as nx
 import numpy as np
 from flamingpy.codes.graphs import EGraph
 from flamingpy.utils import graph_states
+from flamingpy.utils import linalg
+from flamingpy.utils.linalg import pack_bits, unpack_bits, reduce_RREform_mod2
+
+rng = np.random.default_rng(seed=42)
 
 
 def get_adj_mat(graph):
@@ -344,3 +351,150 @@ class TestLCEquivalent:
         # ASSERT:
         assert equiv is False
         assert clifford is None
+
+    # Tests both output clifford_form modes: 'global' and 'tensor'
+    # Runs 2 tests
+    def test_adj_mat_unchanged(self, mode):
+        """Test that checking equivalence does not replace the adjacency
+        matrices previously generated by the user."""
+        # ARRANGE:
+        graph1 = graph_states.complete_graph(4)
+        graph2 = graph_states.star_graph(4)
+        adj1 = get_adj_mat(graph1)
+        # ACT:
+        graph1.is_lc_equivalent(graph2, clifford_form=mode)
+        # ASSERT:
+        assert graph1.adj_mat is adj1
+        assert graph2.adj_mat is None
+
+    # Tests both output clifford_form modes: 'global' and 'tensor'
+    # Runs 2 tests
+    def test_non_egraph_raises_typeerror(self, mode):
+        """Test that comparing against a graph that is not an EGraph raises a
+        TypeError."""
+        # ARRANGE:
+        graph1 = graph_states.complete_graph(3)
+        graph2 = nx.complete_graph(3)
+        # ACT and ASSERT:
+        with pytest.raises(TypeError):
+            graph1.is_lc_equivalent(graph2, clifford_form=mode)
+
+    # Tests both output clifford_form modes: 'global' and 'tensor'
+    # Runs 2 tests
+    def test_pathgraph3_with_disconnectedgraph3_notequivalent(self, mode):
+        """Test False equivalence between path graph --> graph with an isolated
+        node defined on 3 nodes."""
+        # ARRANGE:
+        # define all possible edges
+        edge_1 = {(1, 0, 0), (0, 1, 0)}
+        edge_2 = {(0, 1, 0), (0, 0, 1)}
+        # construct path graph
+        pathgraph3 = EGraph()
+        pathgraph3.add_edges_from([edge_1, edge_2])
+        # construct graph with the same nodes and one isolated node
+        disconnectedgraph3 = EGraph()
+        disconnectedgraph3.add_edges_from([edge_1])
+        disconnectedgraph3.add_node((0, 0, 1))
+        # ACT:
+        # check equivalence pathgraph3 --> disconnectedgraph3
+        equiv, clifford = pathgraph3.is_lc_equivalent(disconnectedgraph3, clifford_form=mode)
+        # ASSERT:
+        assert equiv is False
+        assert clifford is None
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (7, 64), (30, 65), (64, 130)])
+class TestRREform:
+    """Tests for the bit-packed row reduction helpers."""
+
+    def test_pack_unpack_bits(self, shape):
+        """Test that unpack_bits inverts pack_bits."""
+        M = rng.integers(0, 2, size=shape)
+        words, n_cols = pack_bits(M)
+        assert words.dtype == np.uint64
+        assert words.shape == (shape[0], -(-shape[1] // 64))
+        assert np.array_equal(unpack_bits(words, n_cols), M)
+
+    def test_reduce_RREform_mod2(self, shape):
+        """Test that the reduced matrix is in row reduced echelon form and has
+        the same row space as the input matrix."""
+        M = rng.integers(0, 2, size=shape)
+        R, p = reduce_RREform_mod2(M)
+        assert R.dtype == M.dtype
+        # nonzero rows come first, with leading ones in increasing columns
+        assert not R[p:].any()
+        pivots = [np.flatnonzero(row)[0] for row in R[:p]]
+        assert pivots == sorted(set(pivots))
+        # pivot columns are unit vectors
+        assert np.array_equal(R[:p, pivots], np.eye(p, dtype=int))
+        # the rank is preserved and the rows of R span the rows of M
+        R_stack, p_stack = reduce_RREform_mod2(np.concatenate((R[:p], M)))
+        assert p_stack == p
+        assert np.array_equal(R_stack[:p], R[:p])
+
+    def test_max_cols_too_large(self, shape):
+        """Test that reducing more columns than the matrix has raises a
+        ValueError."""
+        M = np.zeros(shape, dtype=int)
+        with pytest.raises(ValueError):
+            reduce_RREform_mod2(M, max_cols=shape[1] + 1)
+        words, _ = pack_bits(M)
+        with pytest.raises(ValueError):
+            linalg.reduce_packed_RREform_mod2(words, max_cols=64 * words.shape[1] + 1)
+
+    def test_kernels_match_numpy(self, shape, monkeypatch):
+        """Test that the uncompiled Python versions of the Numba kernels agree
+        with the NumPy implementations."""
+        M = rng.integers(0, 2, size=shape)
+        basis = rng.integers(0, 2, size=(16, 4 * (shape[0] % 4 + 1)))
+        n = basis.shape[1] // 4
+        words, _ = pack_bits(M)
+        p_kernel = linalg._reduce_packed_RREform_mod2_jit.py_func(words, shape[1])
+        i, j = linalg._search_nullspace_jit.py_func(basis.astype(np.uint8), n)
+        monkeypatch.setattr(linalg, "numba_available", False)
+        words_np, _ = pack_bits(M)
+        p_np = linalg.reduce_packed_RREform_mod2(words_np, shape[1])
+        sol_np = linalg.search_nullspace(basis)
+        assert p_kernel == p_np
+        assert np.array_equal(words, words_np)
+        if sol_np is None:
+            assert i == j == -1
+        else:
+            assert np.array_equal(basis[i] ^ basis[j], sol_np)
+
+    @pytest.mark.skipif(not linalg.numba_available, reason="Numba is not installed.")
+    def test_numba_matches_numpy(self, shape, monkeypatch):
+        """Test that the compiled and NumPy implementations of the row
+        reduction and nullspace search agree."""
+        M = rng.integers(0, 2, size=shape)
+        basis = rng.integers(0, 2, size=(16, 4 * (shape[0] % 4 + 1)))
+        R_jit, p_jit = reduce_RREform_mod2(M)
+        sol_jit = linalg.search_nullspace(basis)
+        monkeypatch.setattr(linalg, "numba_available", False)
+        R_np, p_np = reduce_RREform_mod2(M)
+        sol_np = linalg.search_nullspace(basis)
+        assert p_jit == p_np
+        assert np.array_equal(R_jit, R_np)
+        if sol_np is None:
+            assert sol_jit is None
+        else:
+            assert np.array_equal(sol_jit, sol_np)
+
+    def test_numba_import_error_falls_back(self, shape, monkeypatch):
+        """Test that the NumPy implementations are used, with a warning, when
+        Numba is installed but cannot be imported."""
+        M = rng.integers(0, 2, size=shape)
+        R_np, p_np = reduce_RREform_mod2(M.copy())
+        for name in ("_reduce_packed_RREform_mod2_jit", "_search_nullspace_jit"):
+            kernel = getattr(linalg, name).py_func
+            monkeypatch.setattr(linalg, name, linalg._jit(kernel))
+        monkeypatch.setattr(linalg, "numba_available", True)
+        monkeypatch.setitem(sys.modules, "numba", None)
+        with pytest.warns(ImportWarning):
+            R, p = reduce_RREform_mod2(M)
+        assert not linalg.numba_available
+        assert p == p_np
+        assert np.array_equal(R, R_np)
+        G = graph_states.star_graph(4)
+        H = graph_states.complete_graph(4)
+        assert G.is_lc_equivalent(H)[0]